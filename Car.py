@@ -5,89 +5,66 @@ Individual vehicle agent for traffic simulation
 
 class Car:
     """
-    Represents an individual vehicle agent in the traffic simulation.
-    Each car moves forward and interacts with traffic lights.
+    Lightweight view of a single vehicle in the traffic simulation.
+
+    The per-car state (position, direction, idle time) lives in
+    Structure-of-Arrays NumPy arrays owned by the Environment; this class
+    is a thin proxy over one row of those arrays so code that expects car
+    objects (statistics, printing) keeps working. Aggregate statistics
+    should read the environment arrays (env.positions, env.idle_time)
+    directly rather than building per-car snapshots.
     """
 
-    def __init__(self, unique_id, position, direction):
+    def __init__(self, env, index):
         """
-        Initialize a new car agent.
+        Create a view of one car.
 
         Args:
-            unique_id: Unique identifier for this car
-            position: Starting position as [x, y] coordinates
-            direction: Movement direction as [dx, dy] (e.g., [1, 0] for east)
+            env: Environment that owns the car arrays
+            index: Row index of this car in the environment's arrays
         """
-        self.id = unique_id
-        self.position = list(position)  # Ensure it's a mutable list
-        self.direction = list(direction)
+        self._env = env
+        self._index = index
         self.speed = 1
-        self.idle_time = 0
-        self.has_moved = False
-        self.completed = False
 
-    def step(self, traffic_lights, other_cars):
-        """
-        Called every timestep to update the car's state.
+    @property
+    def id(self):
+        """Unique identifier for this car."""
+        return self._env.car_ids[self._index]
 
-        Args:
-            traffic_lights: List of TrafficLight objects
-            other_cars: List of other Car objects to check for collisions
-        """
-        self.has_moved = False
+    @property
+    def position(self):
+        """Current [x, y] position as an int32 view (no per-access copy)."""
+        return self._env.positions[self._index]
 
-        # Check for car ahead
-        next_position = [self.position[0] + self.direction[0],
-                         self.position[1] + self.direction[1]]
+    @property
+    def direction(self):
+        """Movement [dx, dy] as an int32 view (e.g., [1, 0] for east)."""
+        return self._env.directions[self._index]
 
-        if self.is_position_occupied(next_position, other_cars):
-            self.idle_time += 1
-            return
+    @property
+    def idle_time(self):
+        """Number of timesteps this car has spent stopped."""
+        return int(self._env.idle_time[self._index])
 
-        # Check traffic lights
-        for light in traffic_lights:
-            if self.at_traffic_light(light):
-                if light.state in ["RED", "YELLOW"]:
-                    self.idle_time += 1
-                    return
+    @property
+    def has_moved(self):
+        """Whether this car moved on the most recent timestep."""
+        return bool(self._env.has_moved[self._index])
 
-        # Move forward if no obstacles
-        self.move_forward()
+    @property
+    def completed(self):
+        """Whether this car has left the grid (always False for active cars)."""
+        return False
 
-    def move_forward(self):
-        """Advances the car's position by one step in its direction."""
-        self.position[0] += self.direction[0] * self.speed
-        self.position[1] += self.direction[1] * self.speed
-        self.has_moved = True
+    @property
+    def light_state(self):
+        """State of the light at this car's cell ("GREEN" when there is none)."""
+        x, y = self.position
+        return self._env.light_states.get((int(x), int(y)), "GREEN")
 
     def at_traffic_light(self, traffic_light):
         """Checks if this car is currently at the traffic light position."""
-        return (self.position[0] == traffic_light.position[0] and
-                self.position[1] == traffic_light.position[1])
-
-    def is_position_occupied(self, position, other_cars):
-        """Checks if a given position is occupied by another car."""
-        for car in other_cars:
-            if car.id == self.id:
-                continue
-            if car.position[0] == position[0] and car.position[1] == position[1]:
-                return True
-        return False
-
-    def is_off_grid(self, grid_width, grid_height):
-        """Checks if this car has moved off the grid."""
-        if (self.position[0] < 0 or self.position[0] >= grid_width or
-                self.position[1] < 0 or self.position[1] >= grid_height):
-            self.completed = True
-            return True
-        return False
-
-    def get_stats(self):
-        """Returns performance statistics for this car."""
-        return {
-            'id': self.id,
-            'idle_time': self.idle_time,
-            'position': self.position.copy(),
-            'has_moved': self.has_moved,
-            'completed': self.completed
-        }
\ No newline at end of file
+        position = self.position
+        return (position[0] == traffic_light.position[0] and
+                position[1] == traffic_light.position[1])
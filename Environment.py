@@ -4,9 +4,153 @@ Main simulation environment for 4-way intersection traffic control
 """
 
 import numpy as np
-import random
 from Car import Car
-from TrafficLight import TrafficLightSet
+from TrafficLight import TrafficLightSet, STATE_YELLOW, STATE_NAMES
+
+# Directions are stored as one int8 code per car (N, S, E, W); the unit
+# steps come from these lookup tables, so cars carry 1 byte of direction
+# instead of an 8-byte vector and the kernels replace the speed multiply
+# with a table load. All cars have speed 1.
+DIR_NORTH, DIR_SOUTH, DIR_EAST, DIR_WEST = 0, 1, 2, 3
+DIR_DX = np.array([0, 0, 1, -1], dtype=np.int32)
+DIR_DY = np.array([1, -1, 0, 0], dtype=np.int32)
+DIR_VECS = np.stack([DIR_DX, DIR_DY], axis=1)  # (4, 2) [dx, dy] rows
+
+# The per-tick car update picks the fastest available backend: the
+# ahead-of-time Cython extension if it has been built (see setup.py),
+# else the Numba JIT kernel, else the vectorized NumPy path. When the
+# prebuilt .so is missing but Cython is installed, pyximport compiles
+# the extension on first import so deployments without a build step
+# still get the AOT kernel.
+try:
+    import car_kernel
+    CYTHON_AVAILABLE = True
+except ImportError:
+    try:
+        import pyximport
+        pyximport.install(language_level=3)
+        import car_kernel
+        CYTHON_AVAILABLE = True
+    except ImportError:
+        CYTHON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Thread fan-out only pays off for large populations; below this the
+# serial kernels win on startup overhead.
+PARALLEL_MIN_CARS = 1024
+
+
+def _car_tick(positions, dir_codes, idle_time, has_moved, occupancy,
+              red_mask):
+    """Per-tick car update kernel (compiled with Numba when available).
+
+    Advances each car one cell unless its own cell has a RED/YELLOW light
+    or the target cell is occupied, updating the occupancy grid in place
+    as cars move. The unit step comes from the DIR_DX/DIR_DY tables
+    indexed by the car's int8 direction code.
+    """
+    height, width = occupancy.shape
+    for i in range(positions.shape[0]):
+        x = positions[i, 0]
+        y = positions[i, 1]
+
+        if red_mask[y, x]:
+            has_moved[i] = False
+            idle_time[i] += 1
+            continue
+
+        code = dir_codes[i]
+        nx = x + DIR_DX[code]
+        ny = y + DIR_DY[code]
+        on_grid = 0 <= nx < width and 0 <= ny < height
+
+        if on_grid and occupancy[ny, nx]:
+            has_moved[i] = False
+            idle_time[i] += 1
+            continue
+
+        occupancy[y, x] = False
+        if on_grid:
+            occupancy[ny, nx] = True
+        positions[i, 0] = nx
+        positions[i, 1] = ny
+        has_moved[i] = True
+
+
+def _car_tick_parallel(positions, dir_codes, idle_time, has_moved,
+                       occ_prev, red_mask, claim_count):
+    """Parallel commit phase of the two-phase car update.
+
+    The caller has already counted, in claim_count, how many eligible
+    cars want each cell; a car commits its move only when it holds the
+    sole claim on a free cell (off-grid exits always commit). Each
+    iteration only writes its own car's slots and occ_prev is read-only,
+    so the prange loop is race-free; the occupancy grid is rebuilt in the
+    removal pass. Unlike the serial kernel, a car cannot advance into a
+    cell vacated during the same tick.
+    """
+    height, width = occ_prev.shape
+    for i in prange(positions.shape[0]):
+        x = positions[i, 0]
+        y = positions[i, 1]
+
+        if red_mask[y, x]:
+            has_moved[i] = False
+            idle_time[i] += 1
+            continue
+
+        code = dir_codes[i]
+        nx = x + DIR_DX[code]
+        ny = y + DIR_DY[code]
+        on_grid = 0 <= nx < width and 0 <= ny < height
+
+        if on_grid and (occ_prev[ny, nx] or claim_count[ny, nx] != 1):
+            has_moved[i] = False
+            idle_time[i] += 1
+            continue
+
+        positions[i, 0] = nx
+        positions[i, 1] = ny
+        has_moved[i] = True
+
+
+if NUMBA_AVAILABLE:
+    _car_tick = njit(cache=True, boundscheck=False)(_car_tick)
+    _car_tick_parallel = njit(parallel=True, cache=True,
+                              boundscheck=False)(_car_tick_parallel)
+
+
+def _warmup_kernels():
+    """Trigger Numba compilation of the serial kernel before stepping.
+
+    With cache=True the compiled kernels persist across runs, but a cold
+    cache would otherwise pay the JIT compile inside the first simulation
+    loop; warming here keeps driver loops free of compile stalls.
+
+    The parallel kernel is deliberately NOT run here: executing a
+    parallel=True kernel starts Numba's native threading layer, and a
+    process that has done so deadlocks at exit after forking worker
+    processes (as run_comparison_study does). It compiles lazily on its
+    first real dispatch, which only happens at PARALLEL_MIN_CARS cars.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    positions = np.zeros((1, 2), dtype=np.int32)
+    dir_codes = np.zeros(1, dtype=np.int8)
+    idle_time = np.zeros(1, dtype=np.int32)
+    has_moved = np.zeros(1, dtype=bool)
+    grid = np.zeros((2, 2), dtype=bool)
+    _car_tick(positions, dir_codes, idle_time, has_moved, grid.copy(),
+              grid)
+
+
+_warmup_kernels()
 
 
 class Environment:
@@ -33,9 +177,12 @@ class Environment:
         """
         self.grid_width = grid_width
         self.grid_height = grid_height
-        self.cars = []
+        self._init_car_arrays()
         self.time = 0
 
+        # Batched PCG generator: one draw per tick covers every approach
+        self._rng = np.random.default_rng()
+
         # Spawn rates for different directions
         self.ns_spawn_rate = ns_spawn_rate
         self.ew_spawn_rate = ew_spawn_rate
@@ -43,6 +190,7 @@ class Environment:
         self.max_cars = max_cars
         self.num_lanes = num_lanes
         self.simulation_duration = simulation_duration
+        self._build_spawn_templates()
 
         # Initialize traffic light system
         self.light_set = TrafficLightSet(
@@ -52,6 +200,10 @@ class Environment:
             detection=traffic_mode
         )
 
+        # Light membership never changes after construction, so cache the
+        # combined list instead of concatenating it again every tick
+        self._all_lights = self.light_set.get_all_lights()
+
         # Counters
         self.car_id_counter = 0
         self.total_cars_spawned = 0
@@ -59,19 +211,100 @@ class Environment:
         self.cumulative_idle_time_completed = 0  # NEW: Track idle time of completed cars
         self.is_running = True
 
+    def _init_car_arrays(self):
+        """(Re)create the empty Structure-of-Arrays car storage.
+
+        Per-car state is stored column-wise in NumPy arrays rather than as
+        a list of Car objects so the per-tick update can run as vectorized
+        array operations instead of nested Python loops. The buffers are
+        preallocated with doubling capacity so spawning appends into spare
+        rows instead of reallocating every tick; the first _n rows are the
+        live cars.
+        """
+        self._cap = 1024
+        self._n = 0
+        self._positions = np.empty((self._cap, 2), dtype=np.int32)
+        self._dir_codes = np.empty(self._cap, dtype=np.int8)
+        self._idle_time = np.empty(self._cap, dtype=np.int32)
+        self._has_moved = np.empty(self._cap, dtype=bool)
+        self.car_ids = []
+
+        # Dense occupancy grid: occupancy[y, x] is True iff a car holds
+        # that cell. Updated incrementally on spawn and rebuilt after each
+        # move/removal pass, so position queries are O(1) instead of a
+        # linear scan over every car.
+        self.occupancy = np.zeros((self.grid_height, self.grid_width),
+                                  dtype=bool)
+
+        # Cells where a RED/YELLOW light forces a stop; rebuilt once per
+        # tick right after the lights update instead of per car update.
+        self.red_mask = np.zeros((self.grid_height, self.grid_width),
+                                 dtype=bool)
+
+        # Per-tick lookup table mapping (x, y) -> light state, so "what
+        # light is here" is a single O(1) dict probe rather than a scan
+        # over the light objects. Also feeds the red_mask rebuild.
+        self.light_states = {}
+
+    @property
+    def positions(self):
+        """(N, 2) int32 view of the live car positions."""
+        return self._positions[:self._n]
+
+    @property
+    def dir_codes(self):
+        """(N,) int8 view of the live car direction codes."""
+        return self._dir_codes[:self._n]
+
+    @property
+    def directions(self):
+        """(N, 2) int32 array of unit [dx, dy] steps (built from dir_codes)."""
+        return DIR_VECS[self.dir_codes]
+
+    @property
+    def idle_time(self):
+        """(N,) int32 view of the live car idle times."""
+        return self._idle_time[:self._n]
+
+    @property
+    def has_moved(self):
+        """(N,) bool view of which live cars moved last tick."""
+        return self._has_moved[:self._n]
+
+    def _grow(self, needed):
+        """Double buffer capacity until at least `needed` rows fit."""
+        while self._cap < needed:
+            self._cap *= 2
+        for name in ('_positions', '_dir_codes', '_idle_time',
+                     '_has_moved'):
+            old = getattr(self, name)
+            new = np.empty((self._cap,) + old.shape[1:], dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    @property
+    def cars(self):
+        """List of Car views over the active vehicles (built on demand)."""
+        return [Car(self, i) for i in range(len(self.car_ids))]
+
     def step(self):
-        """Advances the simulation by one timestep."""
-        # Update traffic lights
-        self.light_set.step(self.cars)
+        """Advances the simulation by one timestep.
+
+        Returns the tick's statistics dict so driver loops read them from
+        the state this step just touched instead of re-traversing it with
+        a separate get_statistics() call.
+        """
+        # Update traffic lights, then refresh the stop-cell mask once for
+        # this tick (lights only change state here)
+        self.light_set.step(self.positions, self.has_moved)
+        self._rebuild_red_mask()
 
         # Spawn new cars from all directions
         if self.max_cars is None or self.total_cars_spawned < self.max_cars:
             self.spawn_cars()
 
-        # Update all cars
-        all_lights = self.light_set.get_all_lights()
-        for car in self.cars:
-            car.step(all_lights, self.cars)
+        # Update all cars in one vectorized pass
+        self._advance_cars()
 
         # Remove completed cars
         self.remove_completed_cars()
@@ -83,104 +316,276 @@ class Environment:
         if self.simulation_duration and self.time >= self.simulation_duration:
             self.is_running = False
 
-    def spawn_cars(self):
-        """Spawn cars from all four directions based on spawn rates."""
+        return self.get_statistics()
+
+    def _advance_cars(self):
+        """Vectorized per-tick update of every car (replaces Car.step).
+
+        Computes all next positions, car-ahead blocking, and light blocking
+        as whole-array operations instead of one Python loop per car with
+        an inner scan over every other car.
+        """
+        n = len(self.car_ids)
+        if n == 0:
+            return
+
+        red_mask = self.red_mask
+
+        if NUMBA_AVAILABLE and n >= PARALLEL_MIN_CARS:
+            claim_count = self._claim_moves()
+            _car_tick_parallel(self.positions, self.dir_codes,
+                               self.idle_time, self.has_moved,
+                               self.occupancy, red_mask, claim_count)
+            return
+
+        # The serial kernels process cars in array order with in-place
+        # occupancy updates, so "two cars want the same cell" resolves as
+        # first-wins without a claim phase
+        if CYTHON_AVAILABLE:
+            # uint8 views share memory with the bool arrays
+            car_kernel.car_tick(self.positions, self.dir_codes,
+                                self.idle_time,
+                                self.has_moved.view(np.uint8),
+                                self.occupancy.view(np.uint8),
+                                red_mask.view(np.uint8))
+            return
+
+        if NUMBA_AVAILABLE:
+            _car_tick(self.positions, self.dir_codes, self.idle_time,
+                      self.has_moved, self.occupancy, red_mask)
+            return
+
+        steps = DIR_VECS[self.dir_codes]
+        next_pos = self.positions + steps
+
+        # A car is blocked if its target cell is on the grid and occupied
+        on_grid = ((next_pos[:, 0] >= 0) & (next_pos[:, 0] < self.grid_width) &
+                   (next_pos[:, 1] >= 0) & (next_pos[:, 1] < self.grid_height))
+        blocked_by_car = np.zeros(n, dtype=bool)
+        blocked_by_car[on_grid] = self.occupancy[next_pos[on_grid, 1],
+                                                 next_pos[on_grid, 0]]
+
+        at_red = red_mask[self.positions[:, 1], self.positions[:, 0]]
+
+        # Two-phase commit: cars whose target is free still only move if
+        # they hold the sole claim on it, so perpendicular streams cannot
+        # converge into the same cell (off-grid exits always commit)
+        wants_move = ~(blocked_by_car | at_red)
+        candidate = wants_move & on_grid
+        claim_count = np.zeros((self.grid_height, self.grid_width),
+                               dtype=np.int32)
+        np.add.at(claim_count,
+                  (next_pos[candidate, 1], next_pos[candidate, 0]), 1)
+        claim_ok = np.ones(n, dtype=bool)
+        claim_ok[candidate] = claim_count[next_pos[candidate, 1],
+                                          next_pos[candidate, 0]] == 1
+
+        # Branchless update: unblocked cars advance by direction * 1,
+        # blocked cars by direction * 0 and gain one tick of idle time.
+        # One multiply-add over contiguous int32 memory, no mask gathers.
+        can_move = wants_move & claim_ok
+        step_mask = can_move.astype(np.int32)
+        self.positions[:] += steps * step_mask[:, None]
+        self.idle_time[:] += 1 - step_mask
+        self.has_moved[:] = can_move
+
+    def _claim_moves(self):
+        """Phase A of the parallel update: count claims on target cells.
+
+        Returns an HxW int32 grid where each cell holds the number of
+        eligible cars (not at a red light, target free and on-grid) that
+        want to enter it this tick.
+        """
+        next_pos = self.positions + DIR_VECS[self.dir_codes]
+        on_grid = ((next_pos[:, 0] >= 0) & (next_pos[:, 0] < self.grid_width) &
+                   (next_pos[:, 1] >= 0) & (next_pos[:, 1] < self.grid_height))
+        at_red = self.red_mask[self.positions[:, 1], self.positions[:, 0]]
+
+        candidate = on_grid & ~at_red
+        candidate[candidate] &= ~self.occupancy[next_pos[candidate, 1],
+                                                next_pos[candidate, 0]]
+
+        claim_count = np.zeros((self.grid_height, self.grid_width),
+                               dtype=np.int32)
+        np.add.at(claim_count,
+                  (next_pos[candidate, 1], next_pos[candidate, 0]), 1)
+        return claim_count
+
+    def _rebuild_red_mask(self):
+        """Rebuild the light lookup table and the RED/YELLOW stop mask."""
+        self.light_states = {
+            (light.position[0], light.position[1]): light.state
+            for light in self._all_lights
+        }
+        self.red_mask.fill(False)
+        for light in self._all_lights:
+            if light.state_code <= STATE_YELLOW:
+                self.red_mask[light.position[1], light.position[0]] = True
+
+    def _build_spawn_templates(self):
+        """Precompute candidate spawn cells and directions per approach.
+
+        Rows are grouped per approach (south, north, west, east) with
+        num_lanes rows each, in the order the per-direction spawn loops
+        used, so one occupancy gather per tick replaces four Python loops.
+        """
         y_mid = self.grid_height // 2
         x_mid = self.grid_width // 2
+        template_pos = []
+        template_code = []
+
+        # South approach (moving north)
+        for lane in range(self.num_lanes):
+            template_pos.append([x_mid + lane, 0])
+            template_code.append(DIR_NORTH)
+
+        # North approach (moving south)
+        for lane in range(self.num_lanes):
+            template_pos.append([x_mid - lane - 1, self.grid_height - 1])
+            template_code.append(DIR_SOUTH)
+
+        # West approach (moving east)
+        for lane in range(self.num_lanes):
+            template_pos.append([0, y_mid - lane - 1])
+            template_code.append(DIR_EAST)
+
+        # East approach (moving west)
+        for lane in range(self.num_lanes):
+            template_pos.append([self.grid_width - 1, y_mid + lane])
+            template_code.append(DIR_WEST)
+
+        self.spawn_template_pos = np.array(template_pos, dtype=np.int32)
+        self.spawn_template_code = np.array(template_code, dtype=np.int8)
+
+        # One spawn rate per approach, matching the template row groups
+        self._spawn_rates = np.array([self.ns_spawn_rate, self.ns_spawn_rate,
+                                      self.ew_spawn_rate, self.ew_spawn_rate])
+
+        # When the run length is known, draw every tick's spawn decisions
+        # up front in one batched call; per-tick spawning then reduces to
+        # indexing a row of this table. Open-ended runs keep drawing per
+        # tick.
+        if self.simulation_duration:
+            self._spawn_table = (
+                self._rng.random((self.simulation_duration, 4))
+                < self._spawn_rates)
+        else:
+            self._spawn_table = None
 
-        # Spawn from south (moving north)
-        if random.random() < self.ns_spawn_rate:
-            for lane in range(self.num_lanes):
-                spawn_pos = [x_mid + lane, 0]
-                direction = [0, 1]  # Moving north
-                if not self.is_position_occupied(spawn_pos):
-                    self._create_car(spawn_pos, direction)
-
-        # Spawn from north (moving south)
-        if random.random() < self.ns_spawn_rate:
-            for lane in range(self.num_lanes):
-                spawn_pos = [x_mid - lane - 1, self.grid_height - 1]
-                direction = [0, -1]  # Moving south
-                if not self.is_position_occupied(spawn_pos):
-                    self._create_car(spawn_pos, direction)
-
-        # Spawn from west (moving east)
-        if random.random() < self.ew_spawn_rate:
-            for lane in range(self.num_lanes):
-                spawn_pos = [0, y_mid - lane - 1]
-                direction = [1, 0]  # Moving east
-                if not self.is_position_occupied(spawn_pos):
-                    self._create_car(spawn_pos, direction)
-
-        # Spawn from east (moving west)
-        if random.random() < self.ew_spawn_rate:
-            for lane in range(self.num_lanes):
-                spawn_pos = [self.grid_width - 1, y_mid + lane]
-                direction = [-1, 0]  # Moving west
-                if not self.is_position_occupied(spawn_pos):
-                    self._create_car(spawn_pos, direction)
-
-    def _create_car(self, position, direction):
-        """Helper to create a new car."""
-        new_car = Car(self.car_id_counter, position, direction)
-        self.cars.append(new_car)
-        self.car_id_counter += 1
-        self.total_cars_spawned += 1
+    def spawn_cars(self):
+        """Spawn cars from all four directions based on spawn rates."""
+        # One row of the precomputed spawn table covers all four
+        # approaches; a per-tick draw only happens for open-ended runs
+        if self._spawn_table is not None and self.time < len(self._spawn_table):
+            active = self._spawn_table[self.time]
+        else:
+            active = self._rng.random(4) < self._spawn_rates
+        active = np.repeat(active, self.num_lanes)
+
+        # Filter template rows by the occupancy grid in one gather
+        free = ~self.occupancy[self.spawn_template_pos[:, 1],
+                               self.spawn_template_pos[:, 0]]
+        selected = active & free
+        if selected.any():
+            self._create_cars(self.spawn_template_pos[selected],
+                              self.spawn_template_code[selected])
+
+    def _create_cars(self, positions, dir_codes):
+        """Helper to append a batch of new car rows to the SoA buffers."""
+        k = len(positions)
+        if self._n + k > self._cap:
+            self._grow(self._n + k)
+
+        start, end = self._n, self._n + k
+        self._positions[start:end] = positions
+        self._dir_codes[start:end] = dir_codes
+        self._idle_time[start:end] = 0
+        self._has_moved[start:end] = False
+        self._n = end
+
+        self.occupancy[positions[:, 1], positions[:, 0]] = True
+        self.car_ids.extend(range(self.car_id_counter,
+                                  self.car_id_counter + k))
+        self.car_id_counter += k
+        self.total_cars_spawned += k
 
     def is_position_occupied(self, position):
         """Checks if any car occupies a given position."""
-        for car in self.cars:
-            if car.position[0] == position[0] and car.position[1] == position[1]:
-                return True
-        return False
+        return bool(self.occupancy[position[1], position[0]])
 
     def remove_completed_cars(self):
         """Removes cars that have moved off the grid."""
-        cars_to_keep = []
-        for car in self.cars:
-            if car.is_off_grid(self.grid_width, self.grid_height):
-                self.total_cars_completed += 1
-                self.cumulative_idle_time_completed += car.idle_time  # FIXED: Save idle time before removing
-            else:
-                cars_to_keep.append(car)
-        self.cars = cars_to_keep
+        off = ((self.positions[:, 0] < 0) |
+               (self.positions[:, 0] >= self.grid_width) |
+               (self.positions[:, 1] < 0) |
+               (self.positions[:, 1] >= self.grid_height))
+
+        if off.any():
+            self.total_cars_completed += int(off.sum())
+            self.cumulative_idle_time_completed += int(self.idle_time[off].sum())  # FIXED: Save idle time before removing
+
+            # Compact survivors into the front of the preallocated buffers
+            keep = ~off
+            n_alive = int(keep.sum())
+            self._positions[:n_alive] = self.positions[keep]
+            self._dir_codes[:n_alive] = self.dir_codes[keep]
+            self._idle_time[:n_alive] = self.idle_time[keep]
+            self._has_moved[:n_alive] = self.has_moved[keep]
+            self.car_ids = [cid for cid, k in zip(self.car_ids, keep) if k]
+            self._n = n_alive
+
+        # Rebuild the occupancy grid from the surviving positions
+        self.occupancy.fill(False)
+        if len(self.car_ids):
+            self.occupancy[self.positions[:, 1], self.positions[:, 0]] = True
 
     def get_average_idle_time(self):
         """Calculates average idle time across all completed cars."""
         if self.total_cars_completed == 0:
             return 0.0
-        
+
         # FIXED: Calculate average from cumulative idle time of completed cars
         return self.cumulative_idle_time_completed / self.total_cars_completed
 
     def get_total_idle_time(self):
         """Gets the total idle time summed across all cars (active + completed)."""
         # Total = completed cars + currently active cars
-        active_idle = sum(car.idle_time for car in self.cars)
+        active_idle = int(self.idle_time.sum())
         return self.cumulative_idle_time_completed + active_idle
 
     def get_statistics(self):
         """Gathers comprehensive statistics about simulation state."""
-        all_lights = self.light_set.get_all_lights()
-        ns_state = self.light_set.north_south_lights[0].state if self.light_set.north_south_lights else "N/A"
-        ew_state = self.light_set.east_west_lights[0].state if self.light_set.east_west_lights else "N/A"
+        # Light states travel as integer codes; display code maps them to
+        # names/colors via STATE_NAMES or a LUT
+        ns_state = self.light_set.north_south_lights[0].state_code if self.light_set.north_south_lights else None
+        ew_state = self.light_set.east_west_lights[0].state_code if self.light_set.east_west_lights else None
+
+        # Single C-level reductions over the SoA arrays instead of three
+        # generator passes over car objects
+        cars_moving = int(self.has_moved.sum())
 
         return {
             'time': self.time,
-            'total_cars_active': len(self.cars),
+            'total_cars_active': len(self.car_ids),
             'total_cars_spawned': self.total_cars_spawned,
             'total_cars_completed': self.total_cars_completed,
             'average_idle_time': self.get_average_idle_time(),
             'total_idle_time': self.get_total_idle_time(),
             'ns_light_state': ns_state,
             'ew_light_state': ew_state,
-            'cars_moving': sum(1 for car in self.cars if car.has_moved),
-            'cars_stopped': sum(1 for car in self.cars if not car.has_moved)
+            'cars_moving': cars_moving,
+            'cars_stopped': self.has_moved.size - cars_moving
         }
 
     def reset(self):
         """Resets simulation to initial state."""
-        self.cars = []
+        self._init_car_arrays()
+        # Redraw the batched spawn table so a reset run gets fresh
+        # randomness instead of replaying the previous spawn sequence
+        if self._spawn_table is not None:
+            self._spawn_table = (
+                self._rng.random((self.simulation_duration, 4))
+                < self._spawn_rates)
         self.light_set.reset()
         self.time = 0
         self.car_id_counter = 0
@@ -189,42 +594,48 @@ class Environment:
         self.cumulative_idle_time_completed = 0  # FIXED: Reset cumulative idle time
         self.is_running = True
 
-    def get_grid_state(self):
+    def get_grid_state(self, out=None):
         """
         Returns 2D numpy array representation of the environment.
         0 = empty, 1 = car, 2 = red light, 3 = yellow light, 4 = green light
+
+        Args:
+            out: Optional (grid_height, grid_width) array to fill in
+                place — callers that record many frames pass rows of a
+                preallocated stack instead of taking a fresh allocation
+                per call.
         """
-        grid = np.zeros((self.grid_height, self.grid_width))
-
-        # Place cars
-        for car in self.cars:
-            x = int(car.position[0])
-            y = int(car.position[1])
-            if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-                grid[y, x] = 1
-
-        # Place traffic lights
-        for light in self.light_set.get_all_lights():
-            x = int(light.position[0])
-            y = int(light.position[1])
-            if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-                if light.state == "RED":
-                    grid[y, x] = 2
-                elif light.state == "YELLOW":
-                    grid[y, x] = 3
-                elif light.state == "GREEN":
-                    grid[y, x] = 4
+        if out is None:
+            # The grid carries five discrete codes; int8 keeps a frame at
+            # H*W bytes instead of the 8x larger float64 default
+            grid = np.zeros((self.grid_height, self.grid_width),
+                            dtype=np.int8)
+        else:
+            grid = out
+            grid.fill(0)
+
+        # Scatter cars with one fancy-indexed write (stored cars are
+        # always on-grid after remove_completed_cars)
+        if len(self.car_ids):
+            grid[self.positions[:, 1], self.positions[:, 0]] = 1
+
+        # Scatter traffic lights: grid code is the state code + 2
+        light_pos = self.light_set.light_positions
+        if len(light_pos):
+            grid[light_pos[:, 1], light_pos[:, 0]] = self.light_set.states + 2
 
         return grid
 
     def print_state(self):
         """Prints current simulation state to console."""
         stats = self.get_statistics()
+        ns_name = STATE_NAMES[stats['ns_light_state']]
+        ew_name = STATE_NAMES[stats['ew_light_state']]
         print(f"Time: {self.time}")
-        print(f"NS Lights: {stats['ns_light_state']}, EW Lights: {stats['ew_light_state']}")
-        print(f"Active Cars: {len(self.cars)}")
+        print(f"NS Lights: {ns_name}, EW Lights: {ew_name}")
+        print(f"Active Cars: {stats['total_cars_active']}")
         print(f"Average Idle Time: {self.get_average_idle_time():.2f}")
         print(f"Cars Spawned: {self.total_cars_spawned}")
         print(f"Cars Completed: {self.total_cars_completed}")
         print(f"Moving: {stats['cars_moving']}, Stopped: {stats['cars_stopped']}")
-        print("-" * 40)
\ No newline at end of file
+        print("-" * 40)
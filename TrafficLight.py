@@ -5,27 +5,69 @@ Traffic light control system for 4-way intersection
 
 import numpy as np
 
+# Integer state codes so hot paths can compare ints instead of strings;
+# stop states sort below GREEN, so "must stop" is state_code <= STATE_YELLOW
+STATE_RED = 0
+STATE_YELLOW = 1
+STATE_GREEN = 2
+STATE_CODES = {"RED": STATE_RED, "YELLOW": STATE_YELLOW, "GREEN": STATE_GREEN}
+STATE_NAMES = ("RED", "YELLOW", "GREEN")
+
+
 class TrafficLight:
-    """Individual traffic light with position and state."""
+    """
+    Lightweight view of a single light in a TrafficLightSet.
+
+    Light state and positions live in Structure-of-Arrays NumPy arrays
+    owned by the set (mirroring the Car/Environment split), so state
+    transitions can run as array writes; this class is a thin proxy over
+    one row for code that expects light objects.
+    """
 
-    def __init__(self, position, state="RED", direction="NS"):
+    def __init__(self, light_set, index):
         """
+        Create a view of one light.
+
         Args:
-            position: [x, y] coordinates
-            state: "RED", "YELLOW", or "GREEN"
-            direction: "NS" (north-south) or "EW" (east-west)
+            light_set: TrafficLightSet that owns the light arrays
+            index: Row index of this light in the set's arrays
         """
-        self.position = list(position)
-        self.state = state
-        self.direction = direction  # Which flow this light controls
+        self._set = light_set
+        self._index = index
+        # Positions never change after _initialize_lights, so the tuple
+        # form is built once here instead of on every get_pos call
+        row = light_set.light_positions[index]
+        self._pos_tuple = (int(row[0]), int(row[1]))
+
+    @property
+    def position(self):
+        """[x, y] position as an int32 view."""
+        return self._set.light_positions[self._index]
+
+    @property
+    def state(self):
+        """Current state as its display string ("RED"/"YELLOW"/"GREEN")."""
+        return STATE_NAMES[self._set.states[self._index]]
+
+    @property
+    def state_code(self):
+        """Current state as its integer code."""
+        return int(self._set.states[self._index])
+
+    @property
+    def direction(self):
+        """Which flow this light controls ("NS" or "EW")."""
+        return "NS" if self._set.is_ns[self._index] else "EW"
 
     def set_state(self, new_state):
-        """Update the light state."""
-        self.state = new_state
+        """Update the light state (accepts an integer code or display string)."""
+        if isinstance(new_state, str):
+            new_state = STATE_CODES[new_state]
+        self._set.states[self._index] = new_state
 
     def get_pos(self):
         """Returns position as tuple."""
-        return tuple(self.position)
+        return self._pos_tuple
 
 
 class TrafficLightSet:
@@ -46,11 +88,27 @@ class TrafficLightSet:
             yellow_time: Yellow light duration
             detection: "time_cycle" or "detection_cycle"
         """
+        # Positions are stored as int16 (see _initialize_lights), so
+        # reject grids whose coordinates would not fit
+        if grid_width > np.iinfo(np.int16).max or \
+                grid_height > np.iinfo(np.int16).max:
+            raise ValueError("grid dimensions must fit in int16")
         self.grid_width = grid_width
         self.grid_height = grid_height
         self.num_lanes = num_lanes
         self.detection = detection
 
+        # The mode never changes after construction, so resolve the
+        # dispatch once here instead of re-branching on the string every
+        # tick; unknown modes fail loudly now rather than silently
+        # skipping the update
+        if detection == "time_cycle":
+            self.step = self._time_cycle_step
+        elif detection == "detection_cycle":
+            self.step = self._detection_cycle_step
+        else:
+            raise ValueError(f"Unknown detection mode: {detection!r}")
+
         # Timing parameters
         self.y_green_time = y_green_time
         self.x_green_time = x_green_time
@@ -59,7 +117,19 @@ class TrafficLightSet:
         # Current cycle state
         self.y_turn = True  # True = NS green, False = EW green
         self.current_timer = y_green_time
-        self.current_state = "GREEN"  # GREEN, YELLOW, RED
+        self.current_state = STATE_GREEN
+
+        # Fixed-time control as a precomputed phase table: each row is
+        # (duration, ns_state, ew_state), so stepping is one counter
+        # compare plus a table lookup instead of a branchy state machine
+        self._schedule = (
+            (y_green_time, STATE_GREEN, STATE_RED),
+            (yellow_time, STATE_YELLOW, STATE_RED),
+            (x_green_time, STATE_RED, STATE_GREEN),
+            (yellow_time, STATE_RED, STATE_YELLOW),
+        )
+        self._phase_idx = 0
+        self._phase_tick = 0
 
         # Initialize lights
         self.north_south_lights = []
@@ -67,143 +137,197 @@ class TrafficLightSet:
         self._initialize_lights()
 
     def _initialize_lights(self):
-        """Create traffic lights at intersection positions."""
+        """Create the SoA light arrays at intersection positions.
+
+        NS rows come first (south then north approach per lane), EW rows
+        after (west then east approach per lane); NS lights start GREEN
+        and EW lights start RED.
+        """
         y_mid = self.grid_height // 2
         x_mid = self.grid_width // 2
-
-        # Create lights for each lane
-        for lane in range(self.num_lanes):
-            # North-South lights (start GREEN)
-            # South approach (cars moving north)
-            south_pos = [x_mid + lane, y_mid - self.num_lanes - 1]
-            self.north_south_lights.append(TrafficLight(south_pos, "GREEN", "NS"))
-
-            # North approach (cars moving south)
-            north_pos = [x_mid - lane - 1, y_mid + self.num_lanes]
-            self.north_south_lights.append(TrafficLight(north_pos, "GREEN", "NS"))
-
-            # East-West lights (start RED)
-            # West approach (cars moving east)
-            west_pos = [x_mid - self.num_lanes - 1, y_mid - lane - 1]
-            self.east_west_lights.append(TrafficLight(west_pos, "RED", "EW"))
-
-            # East approach (cars moving west)
-            east_pos = [x_mid + self.num_lanes, y_mid + lane]
-            self.east_west_lights.append(TrafficLight(east_pos, "RED", "EW"))
-
-    def step(self, cars=None):
+        n = self.num_lanes
+        n_ns = 2 * n
+        n_total = 4 * n
+        # NS rows occupy light_positions[:n_ns]; detection counting
+        # slices the position array by this split
+        self._n_ns = n_ns
+
+        # Strided arange fills instead of a Python lane loop; int16 is
+        # plenty for grid coordinates and halves the bytes per position
+        lanes = np.arange(n, dtype=np.int16)
+        pos = np.empty((n_total, 2), dtype=np.int16)
+        # South approach (cars moving north)
+        pos[0:n_ns:2, 0] = x_mid + lanes
+        pos[0:n_ns:2, 1] = y_mid - n - 1
+        # North approach (cars moving south)
+        pos[1:n_ns:2, 0] = x_mid - lanes - 1
+        pos[1:n_ns:2, 1] = y_mid + n
+        # West approach (cars moving east)
+        pos[n_ns::2, 0] = x_mid - n - 1
+        pos[n_ns::2, 1] = y_mid - lanes - 1
+        # East approach (cars moving west)
+        pos[n_ns + 1::2, 0] = x_mid + n
+        pos[n_ns + 1::2, 1] = y_mid + lanes
+
+        self.light_positions = pos
+        self.is_ns = np.zeros(n_total, dtype=bool)
+        self.is_ns[:n_ns] = True
+        self.states = np.where(self.is_ns, STATE_GREEN,
+                               STATE_RED).astype(np.uint8)
+
+        # Row views for code that expects light objects
+        self.north_south_lights = [TrafficLight(self, i)
+                                   for i in range(n_ns)]
+        self.east_west_lights = [TrafficLight(self, i)
+                                 for i in range(n_ns, n_total)]
+        self._all_lights = self.north_south_lights + self.east_west_lights
+
+        # Lights never move, so precompute which cells sit within
+        # Chebyshev distance 2 of a light, one bitmap per direction; the
+        # waiting test is then a single gather per car with no per-light
+        # scan at all
+        self.ns_zone = np.zeros((self.grid_height, self.grid_width),
+                                dtype=bool)
+        self.ew_zone = np.zeros((self.grid_height, self.grid_width),
+                                dtype=bool)
+        for i in range(n_total):
+            zone = self.ns_zone if i < n_ns else self.ew_zone
+            x, y = pos[i]
+            zone[max(0, y - 2):y + 3, max(0, x - 2):x + 3] = True
+        # Flat views for take()-based gathers into reused scratch
+        self._ns_zone_flat = self.ns_zone.ravel()
+        self._ew_zone_flat = self.ew_zone.ravel()
+
+        # Scratch buffers reused across _count_waiting calls so a long
+        # run does no per-tick allocation; grown by doubling when the
+        # car count exceeds the current capacity
+        self._scratch_idx = np.empty(0, dtype=np.intp)
+        self._scratch_mask = np.empty(0, dtype=bool)
+        self._scratch_stopped = np.empty(0, dtype=bool)
+
+    # step is bound per-instance in __init__ to _time_cycle_step or
+    # _detection_cycle_step; both take (positions, has_moved) so callers
+    # need not know which mode is active
+
+    def _time_cycle_step(self, positions=None, has_moved=None,
+                         waiting_counts=None):
+        """Update lights from the fixed-time phase table (car arrays
+        and waiting_counts unused)."""
+        self._phase_tick += 1
+        if self._phase_tick >= self._schedule[self._phase_idx][0]:
+            self._phase_idx = (self._phase_idx + 1) & 3
+            self._phase_tick = 0
+
+            # A phase fully determines every light: two sliced stores
+            _, ns_state, ew_state = self._schedule[self._phase_idx]
+            self.states[:self._n_ns] = ns_state
+            self.states[self._n_ns:] = ew_state
+
+            # Keep the shared cycle fields coherent for readers
+            self.y_turn = self._phase_idx < 2
+            self.current_state = ns_state if self.y_turn else ew_state
+
+    def _detection_cycle_step(self, positions, has_moved,
+                              waiting_counts=None):
         """
-        Update traffic light states based on detection mode.
+        Update lights based on traffic detection.
+        Switch when no cars waiting or after max time.
 
-        Args:
-            cars: List of Car objects (used for detection_cycle mode)
+        Callers that already know the waiting counts from their own car
+        update pass may supply waiting_counts=(ns, ew) to skip the scan
+        here; both values must be given together.
         """
-        if self.detection == "time_cycle":
-            self._time_cycle_step()
-        elif self.detection == "detection_cycle":
-            self._detection_cycle_step(cars)
-
-    def _time_cycle_step(self):
-        """Update lights based on fixed timing."""
         self.current_timer -= 1
 
-        if self.current_state == "GREEN":
-            if self.current_timer <= 0:
-                # Switch to yellow
-                self.current_state = "YELLOW"
-                self.current_timer = self.yellow_time
-                self._set_active_lights("YELLOW")
-
-        elif self.current_state == "YELLOW":
+        if self.current_state == STATE_YELLOW:
+            # A running yellow only waits its timer out; no detection
+            # can change that, so skip the car scan entirely
             if self.current_timer <= 0:
-                # Switch to red, then swap directions
-                self._set_active_lights("RED")
+                self._set_active_lights(STATE_RED)
                 self.y_turn = not self.y_turn
-                self.current_state = "GREEN"
+                self.current_state = STATE_GREEN
 
-                # Set new green time based on direction
                 if self.y_turn:
                     self.current_timer = self.y_green_time
                 else:
                     self.current_timer = self.x_green_time
 
-                self._set_active_lights("GREEN")
+                self._set_active_lights(STATE_GREEN)
+            return
 
-    def _detection_cycle_step(self, cars):
-        """
-        Update lights based on traffic detection.
-        Switch when no cars waiting or after max time.
-        """
-        # Count waiting cars in each direction
-        ns_waiting = self._count_waiting_cars(cars, "NS")
-        ew_waiting = self._count_waiting_cars(cars, "EW")
-
-        self.current_timer -= 1
-
-        if self.current_state == "GREEN":
-            # Check if should switch (no waiting cars or timer expired)
-            active_waiting = ns_waiting if self.y_turn else ew_waiting
-            other_waiting = ew_waiting if self.y_turn else ns_waiting
-
-            max_time = self.y_green_time if self.y_turn else self.x_green_time
-
-            if (active_waiting == 0 and other_waiting > 0) or self.current_timer <= 0:
-                self.current_state = "YELLOW"
-                self.current_timer = self.yellow_time
-                self._set_active_lights("YELLOW")
-
-        elif self.current_state == "YELLOW":
-            if self.current_timer <= 0:
-                self._set_active_lights("RED")
-                self.y_turn = not self.y_turn
-                self.current_state = "GREEN"
-
-                if self.y_turn:
-                    self.current_timer = self.y_green_time
-                else:
-                    self.current_timer = self.x_green_time
+        # GREEN: count waiting cars and check if should switch (no
+        # waiting cars or timer expired)
+        if waiting_counts is not None:
+            ns_waiting, ew_waiting = waiting_counts
+        else:
+            ns_waiting, ew_waiting = self._count_waiting(positions, has_moved)
 
-                self._set_active_lights("GREEN")
+        active_waiting = ns_waiting if self.y_turn else ew_waiting
+        other_waiting = ew_waiting if self.y_turn else ns_waiting
 
-    def _count_waiting_cars(self, cars, direction):
-        """Count cars waiting at lights in given direction."""
-        if not cars:
-            return 0
+        if (active_waiting == 0 and other_waiting > 0) or self.current_timer <= 0:
+            self.current_state = STATE_YELLOW
+            self.current_timer = self.yellow_time
+            self._set_active_lights(STATE_YELLOW)
 
-        lights = self.north_south_lights if direction == "NS" else self.east_west_lights
-        waiting = 0
+    def _count_waiting(self, positions, has_moved):
+        """Count waiting cars near NS and EW lights in one pass.
 
-        for car in cars:
-            for light in lights:
-                # Check if car is near light and not moving
-                if (abs(car.position[0] - light.position[0]) <= 2 and
-                    abs(car.position[1] - light.position[1]) <= 2 and
-                    not car.has_moved):
-                    waiting += 1
-                    break
+        A stopped car counts as waiting when it sits within Chebyshev
+        distance 2 of any light of a direction. The precomputed zone
+        bitmaps answer that with one gather per car and direction — no
+        per-light distances at all.
 
-        return waiting
+        Returns:
+            (ns_count, ew_count) tuple.
+        """
+        if positions is None or len(positions) == 0:
+            return 0, 0
+
+        n = len(positions)
+        if self._scratch_idx.shape[0] < n:
+            cap = max(n, 2 * self._scratch_idx.shape[0])
+            self._scratch_idx = np.empty(cap, dtype=np.intp)
+            self._scratch_mask = np.empty(cap, dtype=bool)
+            self._scratch_stopped = np.empty(cap, dtype=bool)
+        idx = self._scratch_idx[:n]
+        mask = self._scratch_mask[:n]
+        stopped = self._scratch_stopped[:n]
+
+        np.logical_not(has_moved, out=stopped)
+        if not stopped.any():
+            return 0, 0
+
+        # Flatten (x, y) to row-major cell indices in the idx scratch
+        np.multiply(positions[:, 1], self.grid_width, out=idx)
+        np.add(idx, positions[:, 0], out=idx)
+
+        self._ns_zone_flat.take(idx, out=mask)
+        mask &= stopped
+        ns = int(mask.sum())
+        self._ew_zone_flat.take(idx, out=mask)
+        mask &= stopped
+        ew = int(mask.sum())
+        return ns, ew
 
     def _set_active_lights(self, state):
-        """Set state for currently active direction."""
+        """Set the active direction's lights with one sliced store."""
         if self.y_turn:
-            for light in self.north_south_lights:
-                light.set_state(state)
+            self.states[:self._n_ns] = state
         else:
-            for light in self.east_west_lights:
-                light.set_state(state)
+            self.states[self._n_ns:] = state
 
     def get_all_lights(self):
-        """Returns list of all traffic light objects."""
-        return self.north_south_lights + self.east_west_lights
+        """Returns the combined list of light views (treat as read-only)."""
+        return self._all_lights
 
     def reset(self):
         """Reset to initial state."""
         self.y_turn = True
         self.current_timer = self.y_green_time
-        self.current_state = "GREEN"
+        self.current_state = STATE_GREEN
+        self._phase_idx = 0
+        self._phase_tick = 0
 
-        for light in self.north_south_lights:
-            light.set_state("GREEN")
-        for light in self.east_west_lights:
-            light.set_state("RED")
\ No newline at end of file
+        self.states[:self._n_ns] = STATE_GREEN
+        self.states[self._n_ns:] = STATE_RED
\ No newline at end of file
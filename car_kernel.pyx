@@ -0,0 +1,57 @@
+# cython: boundscheck=False, wraparound=False
+"""
+car_kernel.pyx
+Optional ahead-of-time Cython build of the per-tick car update kernel.
+
+Same semantics as the Numba _car_tick in Environment.py: each car
+advances one cell unless its own cell has a RED/YELLOW light or the
+target cell is occupied, updating the occupancy grid in place as cars
+move. Build with:
+
+    python setup.py build_ext --inplace
+"""
+
+
+cpdef void car_tick(int[:, ::1] positions, signed char[::1] dir_codes,
+                    int[::1] idle_time, unsigned char[::1] has_moved,
+                    unsigned char[:, ::1] occupancy,
+                    unsigned char[:, ::1] red_mask):
+    """Advance every car one tick over the raw SoA arrays.
+
+    Directions arrive as int8 codes (N, S, E, W); the unit steps come
+    from local lookup tables, matching DIR_DX/DIR_DY in Environment.py.
+    """
+    cdef Py_ssize_t i, n = positions.shape[0]
+    cdef int height = <int>occupancy.shape[0]
+    cdef int width = <int>occupancy.shape[1]
+    cdef int x, y, nx, ny
+    cdef signed char code
+    cdef bint on_grid
+    cdef int[4] dx = [0, 0, 1, -1]
+    cdef int[4] dy = [1, -1, 0, 0]
+
+    for i in range(n):
+        x = positions[i, 0]
+        y = positions[i, 1]
+
+        if red_mask[y, x]:
+            has_moved[i] = 0
+            idle_time[i] += 1
+            continue
+
+        code = dir_codes[i]
+        nx = x + dx[code]
+        ny = y + dy[code]
+        on_grid = 0 <= nx < width and 0 <= ny < height
+
+        if on_grid and occupancy[ny, nx]:
+            has_moved[i] = 0
+            idle_time[i] += 1
+            continue
+
+        occupancy[y, x] = 0
+        if on_grid:
+            occupancy[ny, nx] = 1
+        positions[i, 0] = nx
+        positions[i, 1] = ny
+        has_moved[i] = 1
@@ -0,0 +1,26 @@
+"""
+setup.py
+Build script for the optional Cython car-update kernel.
+
+The simulation runs without it (Numba or plain NumPy paths); compiling
+the extension gives an ahead-of-time binary for deployments where a JIT
+is not acceptable:
+
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "car_kernel",
+        ["car_kernel.pyx"],
+        extra_compile_args=["-O3", "-march=native"],
+    )
+]
+
+setup(
+    name="traffic-sim-kernels",
+    ext_modules=cythonize(extensions, language_level=3),
+)